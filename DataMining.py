@@ -10,20 +10,17 @@
 # - Palette de couleurs & style personnalisés
 # ------------------------------------------------------------
 
-import os, re
-from collections import Counter
+import hashlib, importlib.util, io, json, os, re
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
-import matplotlib.pyplot as plt
+import plotly.graph_objects as go
 
 # Optionnels (recommandés)
-try:
-    from wordcloud import WordCloud
-    WORDCLOUD_OK = True
-except Exception:
-    WORDCLOUD_OK = False
+# wordcloud : seule la présence est testée ici, l'import (lourd) est différé au premier rendu du nuage
+WORDCLOUD_OK = importlib.util.find_spec("wordcloud") is not None
 
 # Rafraîchissement : on tente d'utiliser streamlit-extras si présent
 try:
@@ -32,6 +29,14 @@ try:
 except Exception:
     EXTRAS_OK = False
 
+# Cache Parquet du CSV : nécessite pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_OK = True
+except Exception:
+    PARQUET_OK = False
+
 st.set_page_config(page_title="Dashboard Jeunes Diplômés – Afrique du Sud", layout="wide", initial_sidebar_state="expanded")
 
 
@@ -108,6 +113,15 @@ st.caption("")
 # Paramètres & chargement
 # -------------------------------
 DEFAULT_PATH = "jeunes_diplomes_afrique_du_sud.csv"
+# Colonnes qualitatives converties en catégories au chargement (isin sur codes entiers)
+CAT_COLS = [
+    "Sexe", "Diplôme", "Q1_Domaine", "Q2_Stage", "Q3_Difficulté", "Q4_Informatique",
+    "Q5_Langues", "Q7_Mobilité", "Q9_Entreprenariat", "Q10_LinkedIn", "Q12_Mentorat"
+]
+# Colonnes numériques réduites au plus petit type adapté (int8/int16/int32, float32)
+NUM_COLS = ["ID", "Âge", "Q6_Salaire_ZAR", "Q8_Formation", "Q11_Candidatures"]
+# Version du format du sidecar Parquet : à incrémenter dès que _prepare() change
+SIDECAR_VERSION = 1
 csv_path = st.sidebar.text_input("Chemin du CSV (local)", value=DEFAULT_PATH)
 
 # Rafraîchissement périodique (désactivé par défaut)
@@ -116,17 +130,69 @@ enable_auto = st.sidebar.checkbox("Activer le rafraîchissement périodique", va
 interval_sec = st.sidebar.slider("Intervalle (secondes)", 5, 300, 30, help="Fréquence de synchronisation automatique.")
 
 # Active le refresh si demandé
+def _csv_mtime():
+    return os.path.getmtime(csv_path) if os.path.isfile(csv_path) else None
+
 if enable_auto:
-    if EXTRAS_OK:
+    if hasattr(st, "fragment"):
+        # Fragment léger : ne relance le script complet (KPIs, graphiques) que si le CSV a changé
+        st.session_state["_last_mtime"] = _csv_mtime()
+
+        @st.fragment(run_every=interval_sec)
+        def _watch_csv():
+            if _csv_mtime() != st.session_state.get("_last_mtime"):
+                st.rerun()
+
+        _watch_csv()
+    elif EXTRAS_OK:
         st_autorefresh(interval=interval_sec * 1000, limit=None, key="auto_refresh_key")
     else:
         st.markdown(f"<meta http-equiv='refresh' content='{interval_sec}'>", unsafe_allow_html=True)
 
-@st.cache_data(ttl=60, show_spinner=False)
-def _read_csv(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path, encoding="utf-8-sig")
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    # Nettoyage commun à toutes les sources : noms de colonnes + types catégoriels
     cols = {c: str(c).strip() for c in df.columns}
     df = df.rename(columns=cols)
+    for col in CAT_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in NUM_COLS:
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+            kind = "integer" if pd.api.types.is_integer_dtype(df[col]) else "float"
+            df[col] = pd.to_numeric(df[col], downcast=kind)
+    return df
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _read_csv(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    # Sidecar Parquet (types catégoriels conservés), relu seulement si sa signature
+    # (mtime_ns, taille du CSV, version de _prepare) correspond exactement au CSV actuel
+    pq_path = path + ".parquet"
+    signature = json.dumps({"mtime_ns": mtime_ns, "size": size, "version": SIDECAR_VERSION}).encode()
+    df = None
+    if PARQUET_OK and os.path.isfile(pq_path):
+        try:
+            if (pq.read_schema(pq_path).metadata or {}).get(b"source_csv") == signature:
+                df = pd.read_parquet(pq_path, memory_map=True)
+        except Exception:
+            df = None
+    if df is None:
+        df = _prepare(pd.read_csv(path, encoding="utf-8-sig"))
+        if PARQUET_OK:
+            try:
+                table = pa.Table.from_pandas(df)
+                table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"source_csv": signature})
+                pq.write_table(table, pq_path, compression="zstd")
+            except Exception:
+                pass
+    # Identifiant stable de la source : sert de clé de cache sans re-hacher le contenu
+    df.attrs["source"] = (path, mtime_ns, size)
+    return df
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _read_bytes(b: bytes) -> pd.DataFrame:
+    # CSV déposé : même préparation que _read_csv, en cache sur le contenu du fichier
+    df = _prepare(pd.read_csv(io.BytesIO(b), encoding="utf-8-sig"))
+    df.attrs["source"] = ("upload", hashlib.sha1(b).hexdigest())
     return df
 
 def _safe_read(path: str) -> pd.DataFrame:
@@ -134,15 +200,23 @@ def _safe_read(path: str) -> pd.DataFrame:
         st.warning(f"Fichier introuvable : {path}. Placez le CSV au bon endroit.")
         st.stop()
     try:
-        return _read_csv(path)
+        stat = os.stat(path)
+        return _read_csv(path, stat.st_mtime_ns, stat.st_size)
     except Exception as e:
         st.error(f"Erreur de lecture CSV : {e}")
         st.stop()
 
+def _source_key(frame: pd.DataFrame):
+    # Clé de cache d'un DataFrame chargé : identifiant de sa source (cf. attrs["source"])
+    return frame.attrs.get("source")
+
+def _as_category(s: pd.Series) -> pd.Series:
+    return s if isinstance(s.dtype, pd.CategoricalDtype) else s.astype("category")
+
 # Upload alternatif
 up = st.sidebar.file_uploader("... ou déposez un CSV ici", type=["csv"])
 if up is not None:
-    df = pd.read_csv(up, encoding="utf-8-sig")
+    df = _read_bytes(up.getvalue())
 else:
     df = _safe_read(csv_path)
 
@@ -150,24 +224,96 @@ else:
 # Filtres globaux (appliqués partout)
 # -------------------------------
 st.sidebar.header("Filtres")
-age_min, age_max = int(df["Âge"].min()), int(df["Âge"].max())
+
+# Modalités triées des listes déroulantes (filtres + formulaire), calculées une fois par source
+UNIQUE_COLS = ["Sexe", "Diplôme", "Q1_Domaine", "Q2_Stage", "Q3_Difficulté", "Q5_Langues", "Q7_Mobilité", "Q10_LinkedIn"]
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _source_key})
+def _uniques(df: pd.DataFrame) -> dict:
+    out = {}
+    for c in UNIQUE_COLS:
+        s = df[c]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            out[c] = s.cat.categories.tolist()
+        else:
+            out[c] = sorted(s.dropna().unique().tolist())
+    out["Âge"] = (int(df["Âge"].min()), int(df["Âge"].max()))
+    return out
+
+uniques = _uniques(df)
+age_min, age_max = uniques["Âge"]
 f_age = st.sidebar.slider("Âge", age_min, age_max, (age_min, age_max))
-f_sexe = st.sidebar.multiselect("Sexe", sorted(df["Sexe"].dropna().unique().tolist()))
-f_diplome = st.sidebar.multiselect("Diplôme", sorted(df["Diplôme"].dropna().unique().tolist()))
-f_domaine = st.sidebar.multiselect("Q1 Domaine", sorted(df["Q1_Domaine"].dropna().unique().tolist()))
-f_stage = st.sidebar.multiselect("Q2 Stage", sorted(df["Q2_Stage"].dropna().unique().tolist()))
-f_mobilite = st.sidebar.multiselect("Q7 Mobilité", sorted(df["Q7_Mobilité"].dropna().unique().tolist()))
-f_linkedin = st.sidebar.multiselect("Q10 LinkedIn", sorted(df["Q10_LinkedIn"].dropna().unique().tolist()))
-
-# Application des filtres
-mask = df["Âge"].between(f_age[0], f_age[1])
-if f_sexe: mask &= df["Sexe"].isin(f_sexe)
-if f_diplome: mask &= df["Diplôme"].isin(f_diplome)
-if f_domaine: mask &= df["Q1_Domaine"].isin(f_domaine)
-if f_stage: mask &= df["Q2_Stage"].isin(f_stage)
-if f_mobilite: mask &= df["Q7_Mobilité"].isin(f_mobilite)
-if f_linkedin: mask &= df["Q10_LinkedIn"].isin(f_linkedin)
-dff = df[mask].copy()
+f_sexe = st.sidebar.multiselect("Sexe", uniques["Sexe"])
+f_diplome = st.sidebar.multiselect("Diplôme", uniques["Diplôme"])
+f_domaine = st.sidebar.multiselect("Q1 Domaine", uniques["Q1_Domaine"])
+f_stage = st.sidebar.multiselect("Q2 Stage", uniques["Q2_Stage"])
+f_mobilite = st.sidebar.multiselect("Q7 Mobilité", uniques["Q7_Mobilité"])
+f_linkedin = st.sidebar.multiselect("Q10 LinkedIn", uniques["Q10_LinkedIn"])
+
+# Application des filtres (masque mis en cache par source + combinaison de filtres)
+@st.cache_data(show_spinner=False, max_entries=64, hash_funcs={pd.DataFrame: _source_key})
+def _filter_mask(df: pd.DataFrame, age_range: tuple, filters: tuple) -> np.ndarray:
+    # Un seul tableau booléen combiné sur place ; appartenance testée sur les codes entiers
+    age = df["Âge"].to_numpy()
+    mask = (age >= age_range[0]) & (age <= age_range[1])
+    for col, selected in filters:
+        if selected:
+            s = _as_category(df[col])
+            allowed = s.cat.categories.get_indexer(list(selected))
+            np.logical_and(mask, np.isin(s.cat.codes.to_numpy(), allowed[allowed >= 0]), out=mask)
+    return mask
+
+mask = _filter_mask(df, tuple(f_age), (
+    ("Sexe", tuple(f_sexe)),
+    ("Diplôme", tuple(f_diplome)),
+    ("Q1_Domaine", tuple(f_domaine)),
+    ("Q2_Stage", tuple(f_stage)),
+    ("Q7_Mobilité", tuple(f_mobilite)),
+    ("Q10_LinkedIn", tuple(f_linkedin)),
+))
+dff = df.loc[mask]
+
+# Comptages par modalité : un passage bincount par colonne, en cache par sélection de lignes
+SUMMARY_COLS = {
+    "Diplôme": "Diplôme", "Sexe": "Sexe", "Q1_Domaine": "Domaine",
+    "Q4_Informatique": "Niveau", "Q7_Mobilité": "Mobilité", "Q10_LinkedIn": "LinkedIn"
+}
+
+# Croisements (comptages par couple de modalités) servis par le même helper
+SUMMARY_PAIRS = (("Diplôme", "Q7_Mobilité"), ("Diplôme", "Q3_Difficulté"))
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def summarize(dff_hash, _dff: pd.DataFrame, cols: tuple, pairs: tuple = SUMMARY_PAIRS) -> dict:
+    summary = {}
+    for col, label in cols:
+        s = _as_category(_dff[col])
+        codes = s.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(s.cat.categories))
+        vc = pd.DataFrame({label: s.cat.categories, "Effectif": counts})
+        vc = vc[vc["Effectif"] > 0].sort_values("Effectif", ascending=False, kind="stable")
+        summary[col] = vc.reset_index(drop=True)
+
+    # Q8 (échelle 1-5) : 5 comptages pré-agrégés au lieu de N valeurs binnées par Plotly
+    vq8 = _dff["Q8_Formation"].value_counts(sort=False).reindex(range(1, 6), fill_value=0)
+    summary["Q8_Formation"] = vq8.rename_axis("Q8_Formation").reset_index(name="Effectif")
+
+    # Croisements sur les codes (équivalent groupby([a, b], observed=True).size())
+    for a_col, b_col in pairs:
+        a, b = _as_category(_dff[a_col]), _as_category(_dff[b_col])
+        a_codes, b_codes = a.cat.codes.to_numpy(), b.cat.codes.to_numpy()
+        ok = (a_codes >= 0) & (b_codes >= 0)
+        n_b = len(b.cat.categories)
+        counts = np.bincount(a_codes[ok].astype(np.int64) * n_b + b_codes[ok], minlength=len(a.cat.categories) * n_b)
+        grp = pd.DataFrame({
+            a_col: np.repeat(a.cat.categories, n_b),
+            b_col: np.tile(b.cat.categories, len(a.cat.categories)),
+            "Effectif": counts,
+        })
+        summary[(a_col, b_col)] = grp[grp["Effectif"] > 0].reset_index(drop=True)
+    return summary
+
+dff_hash = (dff.attrs.get("source"), pd.util.hash_pandas_object(dff.index).to_numpy().tobytes())
+summary = summarize(dff_hash, dff, tuple(SUMMARY_COLS.items()))
 
 # -------------------------------
 # KPIs (basés sur dff)
@@ -180,12 +326,30 @@ def _fmt_float(x):
     except Exception:
         return "0"
 
-nb_rep = len(dff)
-avg_salary = dff["Q6_Salaire_ZAR"].mean() if nb_rep else 0
-stage_rate = dff["Q2_Stage"].eq("Oui").mean() * 100 if nb_rep else 0
-mob_rate = dff["Q7_Mobilité"].eq("Oui").mean() * 100 if nb_rep else 0
-entre_rate = dff["Q9_Entreprenariat"].eq("Oui").mean() * 100 if nb_rep else 0
-li_rate = dff["Q10_LinkedIn"].eq("Oui").mean() * 100 if nb_rep else 0
+# Taux de "Oui" : codes des colonnes empilés, une seule extraction par le masque et une comparaison
+OUI_COLS = ["Q2_Stage", "Q7_Mobilité", "Q9_Entreprenariat", "Q10_LinkedIn"]
+
+@st.cache_data(show_spinner=False, max_entries=64, hash_funcs={pd.DataFrame: _source_key})
+def _kpis(df: pd.DataFrame, mask: np.ndarray) -> dict:
+    nb = int(mask.sum())
+    if not nb:
+        return {"nb": 0, "salary": 0, **{c: 0 for c in OUI_COLS}}
+    salary = np.nanmean(df["Q6_Salaire_ZAR"].to_numpy(dtype=float, na_value=np.nan)[mask])
+    codes, oui = [], []
+    for c in OUI_COLS:
+        s = _as_category(df[c])
+        codes.append(s.cat.codes.to_numpy())
+        oui.append(s.cat.categories.get_loc("Oui") if "Oui" in s.cat.categories else -2)
+    rates = (np.column_stack(codes)[mask] == np.array(oui)).mean(axis=0) * 100
+    return {"nb": nb, "salary": salary, **dict(zip(OUI_COLS, rates.tolist()))}
+
+kpis = _kpis(df, mask)
+nb_rep = kpis["nb"]
+avg_salary = kpis["salary"]
+stage_rate = kpis["Q2_Stage"]
+mob_rate = kpis["Q7_Mobilité"]
+entre_rate = kpis["Q9_Entreprenariat"]
+li_rate = kpis["Q10_LinkedIn"]
 
 col1.markdown(f'<div class="kpi"><h3>Répondants</h3><div class="v">{nb_rep}</div></div>', unsafe_allow_html=True)
 col2.markdown(f'<div class="kpi"><h3>Rémunération moyenne</h3><div class="v">{_fmt_float(avg_salary)}</div></div>', unsafe_allow_html=True)
@@ -194,6 +358,132 @@ col4.markdown(f'<div class="kpi"><h3>Mobilité (%)</h3><div class="v">{mob_rate:
 col5.markdown(f'<div class="kpi"><h3>Entrepreneuriat (%)</h3><div class="v">{entre_rate:.1f}%</div></div>', unsafe_allow_html=True)
 col6.markdown(f'<div class="kpi"><h3>LinkedIn (%)</h3><div class="v">{li_rate:.1f}%</div></div>', unsafe_allow_html=True)
 
+# -------------------------------
+# Nuage de mots : extraction des mots-clés
+# -------------------------------
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_APOS_RE = re.compile(r"[’']")
+_STOP = frozenset({
+    "le","de","un","une","et","en","à","dans","sur","au","aux","du","des","la","les",
+    "je","tu","il","elle","nous","vous","ils","elles","est","sont","être","avoir","pour",
+    "ce","cet","cette","ces","qui","quoi","dont","où","comment","pourquoi","quand",
+    "avec","par","plus","moins","très","tres","bien","mal","ne","pas","se","son","sa","ses"
+})
+
+def _tokenize(series: pd.Series, min_length: int = 3) -> pd.Series:
+    # Pipeline vectorisé .str (regex précompilées) : un mot par ligne, index = ligne d'origine
+    s = (series.dropna().astype(str).str.lower()
+         .str.replace(_PUNCT_RE, " ", regex=True)
+         .str.replace(_APOS_RE, " ", regex=True))
+    words = s.str.split().explode().dropna()
+    return words[(words.str.len() >= min_length) & ~words.isin(_STOP)]
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _category_tokens(categories: tuple, min_length: int = 3):
+    # Tokenisation une fois par modalité : (modalité, mot) sous forme de deux tableaux de codes
+    words = _tokenize(pd.Series(categories, dtype=object), min_length)
+    word_codes, vocab = pd.factorize(words)
+    return words.index.to_numpy(), word_codes, vocab.tolist()
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.Series: lambda s: pd.util.hash_pandas_object(s).values.tobytes()})
+def _extract_keywords_text(series: pd.Series, min_length: int = 3) -> dict:
+    # Ordre sans importance : WordCloud trie lui-même les fréquences
+    return _tokenize(series, min_length).value_counts(sort=False).to_dict()
+
+def extract_keywords(series: pd.Series, min_length: int = 3) -> dict:
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return _extract_keywords_text(series, min_length)
+    # Colonne catégorielle : effectifs par modalité (bincount) pondérant les mots pré-tokenisés
+    cat_idx, word_codes, vocab = _category_tokens(tuple(series.cat.categories), min_length)
+    codes = series.cat.codes.to_numpy()
+    per_cat = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    freq = np.bincount(word_codes, weights=per_cat[cat_idx], minlength=len(vocab)).astype(np.int64)
+    order = np.argsort(-freq, kind="stable")
+    return {vocab[i]: int(freq[i]) for i in order if freq[i] > 0}
+
+@st.cache_resource(show_spinner=False)
+def _load_wc():
+    # None si le paquet est présent mais non importable (ex. : binaire incompatible avec numpy)
+    try:
+        from wordcloud import WordCloud
+        return WordCloud
+    except Exception:
+        return None
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_wordcloud(freq_items: tuple, width: int = 1100, height: int = 450, max_words: int = 150) -> bytes:
+    # WordCloud avec colormap harmonisée ; PNG mémorisé (placement coûteux), sans figure matplotlib
+    WordCloud = _load_wc()
+    wc = WordCloud(width=width, height=height, background_color="white",
+                   max_words=max_words, relative_scaling=0.5, random_state=42,
+                   colormap="viridis")
+    wc = wc.generate_from_frequencies(dict(freq_items))
+    buf = io.BytesIO()
+    wc.to_image().save(buf, "PNG")
+    return buf.getvalue()
+
+# -------------------------------
+# Figures (objets go.Figure en cache, clé = petits tableaux de comptage)
+# cache_resource : la figure est servie telle quelle (ni copie ni revalidation à chaque relance),
+# elle ne doit donc jamais être modifiée après construction
+# -------------------------------
+MARGIN = dict(t=20, b=10, l=10, r=10)
+
+def _show(fig: go.Figure):
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _fig_pie(counts: pd.DataFrame, names: str) -> go.Figure:
+    fig = px.pie(counts, names=names, values="Effectif", hole=0.35)
+    # palette déjà appliquée via px.defaults
+    fig.update_layout(margin=MARGIN)
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _fig_bar(counts: pd.DataFrame, x: str, tickangle=None) -> go.Figure:
+    fig = px.bar(counts, x=x, y="Effectif", text="Effectif")
+    fig.update_traces(textposition="outside")
+    fig.update_layout(margin=MARGIN)
+    if tickangle is not None:
+        fig.update_layout(xaxis_tickangle=tickangle)
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _fig_grouped_bar(grp: pd.DataFrame) -> go.Figure:
+    fig = px.bar(grp, x="Diplôme", y="Effectif", color="Q7_Mobilité", barmode="group")
+    fig.update_layout(xaxis_tickangle=-25, margin=MARGIN)
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _fig_heatmap(ct: pd.DataFrame) -> go.Figure:
+    fig = px.density_heatmap(ct, x="Diplôme", y="Q3_Difficulté", z="Effectif",
+                             text_auto=True, color_continuous_scale=C_SCALE)
+    fig.update_layout(margin=MARGIN)
+    return fig
+
+# Figures sur données brutes : clé = sélection de lignes (dff_hash), le DataFrame n'est pas haché
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _fig_histogram(dff_hash, _dff: pd.DataFrame, col: str, nbins: int) -> go.Figure:
+    fig = px.histogram(_dff, x=col, nbins=nbins)
+    fig.update_layout(margin=MARGIN)
+    return fig
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _fig_candidatures(dff_hash, _dff: pd.DataFrame) -> go.Figure:
+    # Boîte en SVG + points en WebGL (un seul tracé rasterisé au lieu d'un nœud SVG par point)
+    y11 = _dff["Q11_Candidatures"].to_numpy()
+    jitter = np.random.default_rng(42).uniform(-0.1, 0.1, len(y11))
+    fig = go.Figure([
+        go.Box(y=y11, x0=0, name="Q11_Candidatures", boxpoints=False, marker_color=PALETTE[0],
+               hovertemplate="Q11_Candidatures=%{y}<extra></extra>"),
+        go.Scattergl(x=jitter - 0.5, y=y11, mode="markers", name="Q11_Candidatures",
+                     marker=dict(color=PALETTE[0], size=5, line=dict(width=0)),
+                     hovertemplate="Q11_Candidatures=%{y}<extra></extra>"),
+    ])
+    fig.update_layout(template=px.defaults.template, showlegend=False, xaxis_visible=False,
+                      yaxis_title="Q11_Candidatures", margin=MARGIN)
+    return fig
+
 # -------------------------------
 # Onglets
 # -------------------------------
@@ -206,25 +496,17 @@ with tabs[0]:
 
     with c1:
         st.subheader("Répartition par diplôme")
-        vc = dff["Diplôme"].value_counts().reset_index()
+        vc = summary["Diplôme"]
         if not vc.empty:
-            vc.columns = ["Diplôme", "Effectif"]
-            fig = px.pie(vc, names="Diplôme", values="Effectif", hole=0.35)
-            # palette déjà appliquée via px.defaults
-            fig.update_layout(margin=dict(t=20, b=10, l=10, r=10))
-            st.plotly_chart(fig, use_container_width=True)
+            _show(_fig_pie(vc, "Diplôme"))
         else:
             st.info("Aucune donnée après filtrage.")
 
     with c2:
         st.subheader("Répartition par sexe")
-        vsex = dff["Sexe"].value_counts().reset_index()
+        vsex = summary["Sexe"]
         if not vsex.empty:
-            vsex.columns = ["Sexe", "Effectif"]
-            figsx = px.bar(vsex, x="Sexe", y="Effectif", text="Effectif")
-            figsx.update_traces(textposition="outside")
-            figsx.update_layout(margin=dict(t=20, b=10, l=10, r=10))
-            st.plotly_chart(figsx, use_container_width=True)
+            _show(_fig_bar(vsex, "Sexe"))
         else:
             st.info("Aucune donnée après filtrage.")
 
@@ -234,72 +516,40 @@ with tabs[1]:
     e1, e2 = st.columns(2)
     with e1:
         st.subheader("Top 10 domaines souhaités (Q1)")
-        dom = dff["Q1_Domaine"].value_counts().head(10).reset_index()
-        dom.columns = ["Domaine", "Effectif"]
+        dom = summary["Q1_Domaine"].head(10)
         if not dom.empty:
-            fig2 = px.bar(dom, x="Domaine", y="Effectif", text="Effectif")
-            fig2.update_traces(textposition="outside")
-            fig2.update_layout(xaxis_tickangle=-25, margin=dict(t=20, b=10, l=10, r=10))
-            st.plotly_chart(fig2, use_container_width=True)
+            _show(_fig_bar(dom, "Domaine", tickangle=-25))
         else:
             st.info("Aucune donnée après filtrage.")
 
     with e2:
         st.subheader("Distribution des salaires (ZAR) – Q6")
         if not dff.empty:
-            fig3 = px.histogram(dff, x="Q6_Salaire_ZAR", nbins=30)
-            fig3.update_layout(margin=dict(t=20, b=10, l=10, r=10))
-            st.plotly_chart(fig3, use_container_width=True)
+            _show(_fig_histogram(dff_hash, dff, "Q6_Salaire_ZAR", 30))
         else:
             st.info("Aucune donnée après filtrage.")
 
     st.subheader("Candidatures hebdomadaires – Q11")
     if not dff.empty:
-        fig4 = px.box(dff, y="Q11_Candidatures", points="all")
-        fig4.update_layout(margin=dict(t=20, b=10, l=10, r=10))
-        st.plotly_chart(fig4, use_container_width=True)
+        _show(_fig_candidatures(dff_hash, dff))
     else:
         st.info("Aucune donnée après filtrage.")
 
     st.subheader("Nuage de mots (choisir la colonne)")
-    candidates = [c for c in dff.columns if dff[c].dtype == 'object']
+    candidates = [c for c in dff.columns if dff[c].dtype == 'object' or isinstance(dff[c].dtype, pd.CategoricalDtype)]
     if candidates:
         default_idx = candidates.index("Q1_Domaine") if "Q1_Domaine" in candidates else 0
         wc_col = st.selectbox("Colonne source du nuage", options=candidates, index=default_idx, key="wc_col_emploi")
 
-        def extract_keywords(series, min_length=3):
-            stop_words = {
-                "le","de","un","une","et","en","à","dans","sur","au","aux","du","des","la","les",
-                "je","tu","il","elle","nous","vous","ils","elles","est","sont","être","avoir","pour",
-                "ce","cet","cette","ces","qui","quoi","dont","où","comment","pourquoi","quand",
-                "avec","par","plus","moins","très","tres","bien","mal","ne","pas","se","son","sa","ses"
-            }
-            counter = Counter()
-            for t in series.dropna().astype(str):
-                txt = re.sub(r"[^\w\s]", " ", t.lower())
-                txt = txt.replace("’"," ").replace("'"," ")
-                for w in txt.split():
-                    if len(w) >= min_length and w not in stop_words:
-                        counter[w] += 1
-            return counter
-
-        if WORDCLOUD_OK and not dff.empty:
+        wc_cls = _load_wc() if WORDCLOUD_OK and not dff.empty else None
+        if wc_cls is not None:
             freq = extract_keywords(dff[wc_col])
             if freq:
-                # WordCloud avec colormap harmonisée
-                wc = WordCloud(width=1100, height=450, background_color="white",
-                               max_words=150, relative_scaling=0.5, random_state=42,
-                               colormap="viridis")
-                wc = wc.generate_from_frequencies(freq)
-                fig_wc, ax_wc = plt.subplots(figsize=(12, 5))
-                ax_wc.imshow(wc, interpolation="bilinear")
-                ax_wc.axis("off")
-                st.pyplot(fig_wc)
+                st.image(_render_wordcloud(tuple(sorted(freq.items()))), use_container_width=True)
             else:
                 st.info("Pas assez de texte pour générer un nuage.")
-        else:
-            if not WORDCLOUD_OK:
-                st.info("Module wordcloud non installé. Installez-le avec: pip install wordcloud")
+        elif not WORDCLOUD_OK or not dff.empty:
+            st.info("Module wordcloud non installé. Installez-le avec: pip install wordcloud")
     else:
         st.info("Aucune colonne textuelle disponible pour le nuage de mots.")
 
@@ -310,30 +560,19 @@ with tabs[2]:
     with c1:
         st.subheader("Niveau en informatique (Q4)")
         if not dff.empty:
-            vi = dff["Q4_Informatique"].value_counts().reset_index()
-            vi.columns = ["Niveau", "Effectif"]
-            figi = px.bar(vi, x="Niveau", y="Effectif", text="Effectif")
-            figi.update_traces(textposition="outside")
-            figi.update_layout(margin=dict(t=20, b=10, l=10, r=10))
-            st.plotly_chart(figi, use_container_width=True)
+            _show(_fig_bar(summary["Q4_Informatique"], "Niveau"))
         else:
             st.info("Aucune donnée après filtrage.")
     with c2:
         st.subheader("Importance de la formation continue (Q8)")
         if not dff.empty:
-            figf = px.histogram(dff, x="Q8_Formation", nbins=5)
-            figf.update_layout(margin=dict(t=20, b=10, l=10, r=10))
-            st.plotly_chart(figf, use_container_width=True)
+            _show(_fig_bar(summary["Q8_Formation"], "Q8_Formation"))
         else:
             st.info("Aucune donnée après filtrage.")
 
     st.subheader("Usage de LinkedIn (Q10)")
     if not dff.empty:
-        vli = dff["Q10_LinkedIn"].value_counts().reset_index()
-        vli.columns = ["LinkedIn", "Effectif"]
-        figli = px.pie(vli, names="LinkedIn", values="Effectif", hole=0.35)
-        figli.update_layout(margin=dict(t=20, b=10, l=10, r=10))
-        st.plotly_chart(figli, use_container_width=True)
+        _show(_fig_pie(summary["Q10_LinkedIn"], "LinkedIn"))
     else:
         st.info("Aucune donnée après filtrage.")
 
@@ -344,32 +583,21 @@ with tabs[3]:
     with m1:
         st.subheader("Mobilité (Q7)")
         if not dff.empty:
-            vm = dff["Q7_Mobilité"].value_counts().reset_index()
-            vm.columns = ["Mobilité", "Effectif"]
-            figm = px.pie(vm, names="Mobilité", values="Effectif", hole=0.35)
-            figm.update_layout(margin=dict(t=20, b=10, l=10, r=10))
-            st.plotly_chart(figm, use_container_width=True)
+            _show(_fig_pie(summary["Q7_Mobilité"], "Mobilité"))
         else:
             st.info("Aucune donnée après filtrage.")
 
     with m2:
         st.subheader("Mobilité par diplôme")
         if not dff.empty:
-            grp = dff.groupby(["Diplôme", "Q7_Mobilité"]).size().reset_index(name="Effectif")
-            figmm = px.bar(grp, x="Diplôme", y="Effectif", color="Q7_Mobilité", barmode="group")
-            figmm.update_layout(xaxis_tickangle=-25, margin=dict(t=20, b=10, l=10, r=10))
-            st.plotly_chart(figmm, use_container_width=True)
+            _show(_fig_grouped_bar(summary[("Diplôme", "Q7_Mobilité")]))
         else:
             st.info("Aucune donnée après filtrage.")
 
     st.subheader("Difficultés (Q3) × Diplôme")
-    ct = pd.crosstab(dff["Q3_Difficulté"], dff["Diplôme"])
+    ct = summary[("Diplôme", "Q3_Difficulté")]
     if not ct.empty:
-        ct = ct.reset_index().melt(id_vars="Q3_Difficulté", var_name="Diplôme", value_name="Effectif")
-        fig5 = px.density_heatmap(ct, x="Diplôme", y="Q3_Difficulté", z="Effectif",
-                                  text_auto=True, color_continuous_scale=C_SCALE)
-        fig5.update_layout(margin=dict(t=20, b=10, l=10, r=10))
-        st.plotly_chart(fig5, use_container_width=True)
+        _show(_fig_heatmap(ct))
     else:
         st.info("Pas assez de données après filtrage.")
 
@@ -377,8 +605,16 @@ with tabs[3]:
 # Export (sans table)
 # -------------------------------
 st.markdown('<div class="section-title">Export des données filtrées</div>', unsafe_allow_html=True)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _csv_bytes(dff_hash, _dff: pd.DataFrame) -> bytes:
+    # Écriture encodée directement dans un tampon binaire, par blocs (pas de str intermédiaire)
+    buf = io.BytesIO()
+    _dff.to_csv(buf, index=False, encoding="utf-8-sig", chunksize=10_000)
+    return buf.getvalue()
+
 st.download_button("Télécharger les données filtrées (CSV)",
-                   dff.to_csv(index=False).encode("utf-8-sig"),
+                   _csv_bytes(dff_hash, dff),
                    "donnees_filtrees.csv", "text/csv")
 
 # -------------------------------
@@ -386,29 +622,33 @@ st.download_button("Télécharger les données filtrées (CSV)",
 # -------------------------------
 st.markdown('<div class="section-title">Ajouter une nouvelle réponse</div>', unsafe_allow_html=True)
 with st.expander("Ouvrir le formulaire d'ajout"):
-    _id = int((df["ID"].max() if "ID" in df.columns else 0) + 1)
-    c1, c2, c3 = st.columns(3)
-    with c1:
-        st.text_input("ID (auto)", value=str(_id), disabled=True)
-        age = st.number_input("Âge", 18, 60, 23)
-        sexe = st.selectbox("Sexe", ["M", "F"])
-        dipl = st.selectbox("Diplôme", sorted(df["Diplôme"].dropna().unique().tolist()))
-        domaine = st.selectbox("Q1 Domaine", sorted(df["Q1_Domaine"].dropna().unique().tolist()))
-    with c2:
-        stage = st.selectbox("Q2 Stage", ["Oui", "Non"])
-        diff = st.selectbox("Q3 Difficulté", sorted(df["Q3_Difficulté"].dropna().unique().tolist()))
-        info = st.selectbox("Q4 Informatique", ["Faible","Moyen","Avancé"])
-        langues = st.selectbox("Q5 Langues", sorted(df["Q5_Langues"].dropna().unique().tolist()))
-        salaire = st.number_input("Q6 Salaire (ZAR)", 0, 100000, 12000, 500)
-    with c3:
-        mobilite = st.selectbox("Q7 Mobilité", ["Oui","Non"])
-        form = st.slider("Q8 Formation (1-5)", 1, 5, 4)
-        entre = st.selectbox("Q9 Entreprenariat", ["Oui","Non"])
-        li = st.selectbox("Q10 LinkedIn", ["Oui","Non"])
-        candid = st.number_input("Q11 Candidatures/sem.", 0, 100, 5, 1)
-        mentor = st.selectbox("Q12 Mentorat", ["Oui","Non"])
-
-    if st.button("Ajouter"):
+    # Formulaire : une seule relance du script à la validation, pas à chaque saisie
+    with st.form("add_response", clear_on_submit=True):
+        _id = int(df["ID"].max() if "ID" in df.columns else 0) + 1
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            st.text_input("ID (auto)", value=str(_id), disabled=True)
+            age = st.number_input("Âge", 18, 60, 23)
+            sexe = st.selectbox("Sexe", ["M", "F"])
+            dipl = st.selectbox("Diplôme", uniques["Diplôme"])
+            domaine = st.selectbox("Q1 Domaine", uniques["Q1_Domaine"])
+        with c2:
+            stage = st.selectbox("Q2 Stage", ["Oui", "Non"])
+            diff = st.selectbox("Q3 Difficulté", uniques["Q3_Difficulté"])
+            info = st.selectbox("Q4 Informatique", ["Faible","Moyen","Avancé"])
+            langues = st.selectbox("Q5 Langues", uniques["Q5_Langues"])
+            salaire = st.number_input("Q6 Salaire (ZAR)", 0, 100000, 12000, 500)
+        with c3:
+            mobilite = st.selectbox("Q7 Mobilité", ["Oui","Non"])
+            form = st.slider("Q8 Formation (1-5)", 1, 5, 4)
+            entre = st.selectbox("Q9 Entreprenariat", ["Oui","Non"])
+            li = st.selectbox("Q10 LinkedIn", ["Oui","Non"])
+            candid = st.number_input("Q11 Candidatures/sem.", 0, 100, 5, 1)
+            mentor = st.selectbox("Q12 Mentorat", ["Oui","Non"])
+
+        submitted = st.form_submit_button("Ajouter")
+
+    if submitted:
         new_row = {
             "ID": _id, "Âge": age, "Sexe": sexe, "Diplôme": dipl,
             "Q1_Domaine": domaine, "Q2_Stage": stage, "Q3_Difficulté": diff, "Q4_Informatique": info,
@@ -417,9 +657,24 @@ with st.expander("Ouvrir le formulaire d'ajout"):
             "Q11_Candidatures": candid, "Q12_Mentorat": mentor
         }
         try:
-            base = pd.read_csv(csv_path, encoding="utf-8-sig") if os.path.isfile(csv_path) else df.copy()
-            base = pd.concat([base, pd.DataFrame([new_row])], ignore_index=True)
-            base.to_csv(csv_path, index=False, encoding="utf-8-sig")
+            if os.path.isfile(csv_path):
+                # Ajout en fin de fichier (O(1)) dans l'ordre des colonnes de l'en-tête existant
+                header = [str(c).strip() for c in pd.read_csv(csv_path, nrows=0, encoding="utf-8-sig").columns]
+                with open(csv_path, "ab+") as fh:
+                    # Saut de ligne final garanti avant l'ajout
+                    if fh.seek(0, os.SEEK_END) > 0:
+                        fh.seek(-1, os.SEEK_END)
+                        if fh.read(1) != b"\n":
+                            fh.write(b"\n")
+                pd.DataFrame([new_row]).reindex(columns=header).to_csv(
+                    csv_path, mode="a", header=False, index=False, encoding="utf-8-sig")
+            else:
+                base = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+                base.to_csv(csv_path, index=False, encoding="utf-8-sig")
+            # Le sidecar Parquet et le cache de lecture sont périmés
+            if os.path.isfile(csv_path + ".parquet"):
+                os.remove(csv_path + ".parquet")
+            _read_csv.clear()
             st.success("Réponse ajoutée. Le fichier CSV a été mis à jour.")
             st.rerun()
         except Exception as e: